@@ -1,34 +1,13 @@
 #!/usr/bin/env python3
-import subprocess
-import json
 import sys
-import re
+
+from script_filter import emit, script_filter
 
 # Get optional filter key from command line argument
 if len(sys.argv) < 2:
     exit(0)
 
-list_type = sys.argv[1] or ' '
-
-# Build command with optional filter parameter
-cmd = f"goto list {list_type}".split(" ")
-
-result = subprocess.run(cmd, capture_output=True, text=True)
-lines = result.stdout.strip().split('\n')[1:]
-
-items = []
-for key in lines:
-    matches = re.match(r'^- ([\w|-]+?): (.+)', key)
-
-    if not matches: continue
-
-    key, value = matches.group(1, 2)
-    items.append({
-        "title": key,
-        "subtitle": value,
-        "arg": key,
-        "autocomplete": key,
-    })
+list_type = sys.argv[1].strip() or None
+query = sys.argv[2] if len(sys.argv) > 2 else ""
 
-output = {"items": items}
-print(json.dumps(output, indent=4, ensure_ascii=False))
+emit(script_filter("goto", list_type, query))
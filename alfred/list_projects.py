@@ -1,27 +1,10 @@
 #!/usr/bin/env python3
-import subprocess
-import json
 import sys
 
+from script_filter import emit, script_filter
+
 # Get optional filter key from command line argument
 filter_key = sys.argv[1] if len(sys.argv) > 1 else None
+query = sys.argv[2] if len(sys.argv) > 2 else ""
 
-# Build command with optional filter parameter
-cmd = ['project', 'list']
-if filter_key:
-    cmd.append(filter_key)
-
-result = subprocess.run(cmd, capture_output=True, text=True)
-lines = result.stdout.strip().split('\n')
-
-items = []
-for key in lines:
-    key = key.strip().split(" ").pop(0).strip()
-    items.append({
-        "title": key,
-        "arg": key,
-        "autocomplete": key,
-    })
-
-output = {"items": items}
-print(json.dumps(output, indent=4))
+emit(script_filter("projects", filter_key or None, query))
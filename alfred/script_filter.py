@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Alfred Script Filter backend for projects and goto shortcuts.
+
+Reads ~/.project-cli/projects.json in-process instead of shelling out to
+`project`/`goto`, and keeps the last result set per list in a small cache
+keyed by the store's mtime/size/inode. When the query extends the previous one,
+the previous matches are filtered instead of the whole list.
+
+Usage:
+    script_filter.py projects [--key KEY] [query]
+    script_filter.py goto [--type url|dir] [query]
+    script_filter.py not-cloned [query]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# project_store.py lives in the repo root and is installed next to `project`/`goto`
+for _dir in (Path(__file__).resolve().parent.parent, Path(shutil.which("project") or __file__).resolve().parent):
+    if str(_dir) not in sys.path:
+        sys.path.append(str(_dir))
+
+import project_store  # noqa: E402
+
+CACHE_DIR = Path(os.environ.get("alfred_workflow_cache") or project_store.CONFIG_DIR / "alfred-cache")
+
+
+def build_items(mode, arg):
+    d = project_store.load_data()
+    projects, active = d["projects"], d["meta"].get("active-project")
+
+    if mode == "projects":
+        names = projects.keys()
+        if arg:
+            inverted = arg.startswith("!")
+            key = arg[1:] if inverted else arg
+            names = [p for p in names if (key in projects[p]) != inverted]
+        return [{"title": p, "arg": p, "autocomplete": p} for p in sorted(names)]
+
+    if mode == "not-cloned":
+        names = [p for p, entries in projects.items() if "repo" in entries and "dir" not in entries]
+        return [{"title": p, "arg": p, "autocomplete": p} for p in sorted(names)]
+
+    # goto: shortcuts of the active project, optionally only urls or dirs
+    entries = projects.get(active) or {}
+    items = []
+    for k, v in entries.items():
+        is_url = v.startswith("http")
+        if arg == "url" and not is_url or arg == "dir" and is_url:
+            continue
+        item = {"title": k, "subtitle": v, "arg": k, "autocomplete": k}
+        if not is_url:
+            try:
+                item["subtitle"] = project_store.resolve_dir(v)
+            except ValueError as e:
+                item.update(subtitle=str(e), valid=False)
+        items.append(item)
+    return items
+
+
+def matches(item, query):
+    return query in item["title"].lower() or query in item.get("subtitle", "").lower()
+
+
+def cache_file(mode, arg):
+    return CACHE_DIR / f"{mode}-{arg or '_'}.json"
+
+
+def read_cache(path, stamp):
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cache if cache.get("stamp") == stamp else None
+
+
+def write_cache(path, cache):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, separators=(",", ":"), ensure_ascii=False)
+        tmp.replace(path)
+    except OSError:
+        pass  # caching is best effort
+
+
+def script_filter(mode, arg=None, query=""):
+    """Return the Alfred items for `mode`/`arg` that match `query`."""
+    query = query.strip().lower()
+    stamp = project_store.store_stamp()
+    path = cache_file(mode, arg)
+    cache = read_cache(path, stamp)
+
+    if cache is None:
+        cache = {"stamp": stamp, "all": build_items(mode, arg), "query": "", "matches": None}
+    if cache["query"] == query and cache["matches"] is not None:
+        return cache["matches"]
+
+    # Narrowing the previous query can only drop results, so start from its matches
+    prior = cache["matches"] if cache["matches"] is not None and query.startswith(cache["query"]) else cache["all"]
+    result = [item for item in prior if matches(item, query)] if query else cache["all"]
+
+    cache["query"], cache["matches"] = query, result
+    write_cache(path, cache)
+    return result
+
+
+def emit(items):
+    # No Alfred "cache" directive: it would replay the previous query's results,
+    # while filtering by query happens here
+    sys.stdout.write(json.dumps({"items": items}, separators=(",", ":"), ensure_ascii=False))
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="script_filter.py")
+    p.add_argument("mode", choices=["projects", "goto", "not-cloned"])
+    p.add_argument("query", nargs="?", default="")
+    p.add_argument("--key", help="projects: only projects having (or with !KEY, lacking) this shortcut")
+    p.add_argument("--type", choices=["url", "dir"], help="goto: only URL or directory shortcuts")
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    arg = args.key if args.mode == "projects" else args.type if args.mode == "goto" else None
+    try:
+        emit(script_filter(args.mode, arg, args.query))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
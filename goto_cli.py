@@ -2,68 +2,77 @@
 import argparse
 import sys
 import os
-import json
-from pathlib import Path
 
-CONFIG_DIR = Path.home() / ".project-cli"
-DATA_FILE = CONFIG_DIR / "projects.json"
-
-
-def load_data():
-    if not DATA_FILE.exists():
-        return {}
-    with DATA_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_data(d):
-    tmp = DATA_FILE.with_suffix(".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(d, f, indent=2, ensure_ascii=False)
-    tmp.replace(DATA_FILE)
+from project_store import derived, journal_append, load_data, portable_path, resolve_dir, save_data
 
 
 def ensure_active(d):
-    active = d.get("active-project")
-    if not active or active not in d:
+    active = d["meta"].get("active-project")
+    if not active or active not in d["projects"]:
         print("No active project.", file=sys.stderr)
         sys.exit(2)
     return active
 
 
+def _resolve_or_exit(val: str) -> str:
+    try:
+        return resolve_dir(val)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+
 # --- Goto commands ---
 def goto_add(args):
     d = load_data()
     active = ensure_active(d)
     key, val = args.key, args.value
-    if key in d[active]:
+    if key in d["projects"][active]:
         print(f"Shortcut '{key}' already exists.", file=sys.stderr)
         sys.exit(1)
-    stored = val if val.startswith("http") else os.path.abspath(val)
-    d[active][key] = stored
+    try:
+        stored = val if val.startswith("http") else portable_path(val)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    before = dict(d["projects"][active])
+    d["projects"][active][key] = stored
     save_data(d)
+    journal_append(f"goto add {key}", {active: [before, d["projects"][active]]})
     print(f"[{active}] set '{key}' -> {stored}")
 
 
 def goto_update(args):
     d = load_data()
     active = ensure_active(d)
-    if args.key not in d[active]:
+    if args.key not in d["projects"][active]:
         print(f"No such shortcut: {args.key}", file=sys.stderr)
         sys.exit(1)
-    new_val = args.value if args.value.startswith("http") else os.path.abspath(args.value)
+    try:
+        new_val = args.value if args.value.startswith("http") else portable_path(args.value)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
     print(new_val)
-    d[active][args.key] = new_val
+    before = dict(d["projects"][active])
+    d["projects"][active][args.key] = new_val
     save_data(d)
+    journal_append(f"goto update {args.key}", {active: [before, d["projects"][active]]})
     print(f"[{active}] updated '{args.key}' -> {new_val}")
 
 
 def goto_list(args):
     d = load_data()
     active = ensure_active(d)
-    entries = d.get(active, {})
+    entries = d["projects"].get(active, {})
     urls = {k: v for k, v in entries.items() if v.startswith("http")}
-    dirs = {k: v for k, v in entries.items() if not v.startswith("http")}
+    dirs, errors = {}, []
+    for k, v in entries.items():
+        if not v.startswith("http"):
+            try:
+                dirs[k] = resolve_dir(v)
+            except ValueError as e:
+                errors.append(f"{k}: {e}")
 
     if urls:
         if args.filter is None or args.filter == "url":
@@ -76,37 +85,45 @@ def goto_list(args):
             print("Directories:")
             for k, v in dirs.items():
                 print(f"- {k}: {v}")
+    if errors:
+        for err in errors:
+            print(err, file=sys.stderr)
+        sys.exit(1)
 
 
 def goto_rename(args):
     d = load_data()
     active = ensure_active(d)
-    if args.old not in d[active]:
+    if args.old not in d["projects"][active]:
         print(f"No such shortcut: {args.old}", file=sys.stderr)
         sys.exit(1)
-    if args.new in d[active]:
+    if args.new in d["projects"][active]:
         print(f"Shortcut '{args.new}' already exists.", file=sys.stderr)
         sys.exit(1)
-    d[active][args.new] = d[active].pop(args.old)
+    before = dict(d["projects"][active])
+    d["projects"][active][args.new] = d["projects"][active].pop(args.old)
     save_data(d)
+    journal_append(f"goto rename {args.old} {args.new}", {active: [before, d["projects"][active]]})
     print(f"[{active}] renamed '{args.old}' -> '{args.new}'")
 
 
 def goto_remove(args):
     d = load_data()
     active = ensure_active(d)
-    if args.key not in d[active]:
+    if args.key not in d["projects"][active]:
         print(f"No such shortcut: {args.key}", file=sys.stderr)
         sys.exit(1)
-    del d[active][args.key]
+    before = dict(d["projects"][active])
+    del d["projects"][active][args.key]
     save_data(d)
+    journal_append(f"goto remove {args.key}", {active: [before, d["projects"][active]]})
     print(f"[{active}] removed '{args.key}'")
 
 
 def goto_key(args):
     d = load_data()
     active = ensure_active(d)
-    entries = d.get(active, {})
+    entries = d["projects"].get(active, {})
     target = entries.get(args.key)
     if not target:
         print(f"No such shortcut: {args.key}", file=sys.stderr)
@@ -114,16 +131,26 @@ def goto_key(args):
     if target.startswith("http"):
         os.system(f"open {target}")
     else:
-        print(f"{target}")
+        print(_resolve_or_exit(target))
 
 
 def goto_haskey(args):
     d = load_data()
     active = ensure_active(d)
-    entries = d.get(active, {})
+    entries = d["projects"].get(active, {})
     val = entries.get(args.key)
     if val:
-        print(val)
+        print(val if val.startswith("http") else _resolve_or_exit(val))
+
+
+# -------- Hidden completion helpers (used by shell completions) -------- #
+
+def _print_shortcut_keys():
+    def build(d):
+        return list(d["projects"].get(d["meta"].get("active-project"), {}))
+
+    for k in derived("shortcut-keys", build):
+        print(k)
 
 
 def build_parser():
@@ -162,6 +189,11 @@ def build_parser():
 
 
 def main():
+    # Hidden completion switch
+    if "--_complete-keys" in sys.argv:
+        _print_shortcut_keys()
+        return
+
     parser = build_parser()
     known_cmds = {"add", "update", "list", "rename", "remove", "haskey"}
     if len(sys.argv) > 1 and sys.argv[1] in ("--help", "-h"):
@@ -28,4 +28,8 @@ for NAME in "${!SCRIPTS[@]}"; do
   mkdir -p "$(dirname "$TARGET")"
   cp "$SCRIPT" "$TARGET"
   echo "Installed $SCRIPT to $TARGET"
-done
\ No newline at end of file
+done
+
+# Both commands import the shared storage module from their own directory
+cp "project_store.py" "$TARGET_DIR/project_store.py"
+echo "Installed project_store.py to $TARGET_DIR"
\ No newline at end of file
@@ -2,50 +2,58 @@
 import argparse
 import json
 import os
+import re
 import sys
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from project_store import (config_path, derived, expand_path, journal_append, load_data, portable_path,
+                           read_journal, resolve_dir, save_data, write_journal)
+
 APP_NAME = "project-cli"
-CONFIG_DIR = Path.home() / ".project-cli"
-DATA_FILE = CONFIG_DIR / "projects.json"
 DEBUG = False
 
-KNOWN_SUBCMDS = {"add", "list", "rename", "remove", "active"}
+KNOWN_SUBCMDS = {"add", "list", "rename", "remove", "active", "undo", "history", "status", "exec", "tag", "relocate"}
 
 
 # ---------------- Utilities ---------------- #
 
-def expand_path(p: str) -> str:
-    return os.path.expanduser(os.path.expandvars(p))
-
-
-def load_data() -> dict:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    if not DATA_FILE.exists():
-        return {}
-    try:
-        with DATA_FILE.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        print(f"Error: {DATA_FILE} is not valid JSON.")
-        sys.exit(1)
-
-
-def save_data(d: dict) -> None:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    tmp = DATA_FILE.with_suffix(".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(d, f, indent=2, ensure_ascii=False)
-    tmp.replace(DATA_FILE)
+# ---------------- Tags ---------------- #
+# Tags live in the store as {tag: [project, ...]}; combining tags intersects those lists.
+
+def projects_with_tags(d: dict, tags: list) -> set:
+    """Names of the projects in `d` carrying every tag in `tags`."""
+    names = set(d["projects"])
+    for tag in tags:
+        names &= set(d.get("tags", {}).get(tag, ()))
+    return names
+
+
+def retag_project(d: dict, old: str, new: str = None) -> dict:
+    """Move `old`'s tag memberships to `new` (or drop them). Returns journal tag changes."""
+    changes = {}
+    tags = d.setdefault("tags", {})
+    for tag, members in list(tags.items()):
+        if old not in members and new not in members:
+            continue
+        after = sorted(set(members) - {old, new} | ({new} if new and old in members else set()))
+        changes[tag] = [members, after or None]
+        if after:
+            tags[tag] = after
+        else:
+            del tags[tag]
+    return changes
 
 
 def ensure_active(d: dict) -> str:
-    active = d.get("active-project")
+    active = d["meta"].get("active-project")
     if not active:
         print("No active project. Select one: `project <name>` or create with `project add <name>`. ", file=sys.stderr)
         sys.exit(2)
-    if active not in d:
+    if active not in d["projects"]:
         print(f"Active project '{active}' missing. Fix by selecting another: `project <name>`.", file=sys.stderr)
         sys.exit(2)
     return active
@@ -63,41 +71,191 @@ def mac_open(target: str) -> int:
 # -------- Hidden completion helpers (used by shell completions) -------- #
 
 def _print_project_names():
-    d = load_data()
-    for k in d.keys():
-        if k != "active-project":
-            print(k)
+    for k in derived("project-names", lambda d: list(d["projects"])):
+        print(k)
+
+
+# ---------------- Git status ---------------- #
+# HEAD and refs are read straight from .git; git itself only runs for the
+# working tree state and for ahead/behind counts when local != upstream.
+
+def git_dirs(path: Path):
+    """Return (git dir, common dir) for a work tree, or (None, None) if it is not a repo."""
+    dot_git = path / ".git"
+    if dot_git.is_file():  # worktree or submodule: "gitdir: <path>"
+        gdir = Path(dot_git.read_text().split(":", 1)[1].strip())
+        gdir = gdir if gdir.is_absolute() else (path / gdir).resolve()
+    elif dot_git.is_dir():
+        gdir = dot_git
+    else:
+        return None, None
+    common = gdir / "commondir"
+    if common.exists():
+        return gdir, (gdir / common.read_text().strip()).resolve()
+    return gdir, gdir
+
+
+def read_ref(common: Path, ref: str):
+    loose = common / ref
+    if loose.is_file():
+        return loose.read_text().strip()
+    packed = common / "packed-refs"
+    if packed.exists():
+        for line in packed.read_text().splitlines():
+            if line.endswith(" " + ref):
+                return line.split(" ", 1)[0]
+    return None
+
+
+def default_branch(common: Path) -> str:
+    origin_head = common / "refs" / "remotes" / "origin" / "HEAD"
+    if origin_head.is_file():
+        head = origin_head.read_text().strip()
+        if head.startswith("ref: refs/remotes/origin/"):
+            return head[len("ref: refs/remotes/origin/"):]
+    for name in ("main", "master"):
+        if read_ref(common, f"refs/heads/{name}"):
+            return name
+    return "main"
+
+
+def _git(path: Path, *args) -> str:
+    # --no-optional-locks: a background scan must not take index.lock in repos being worked in
+    result = subprocess.run(["git", "--no-optional-locks", "-C", str(path), *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"git {args[0]} exited with {result.returncode}")
+    return result.stdout
+
+
+def repo_status(path: Path, cache: dict) -> dict:
+    gdir, common = git_dirs(path)
+    if gdir is None:
+        return {"dir": str(path), "error": "not a git repository" if path.exists() else "missing"}
+
+    head = (gdir / "HEAD").read_text().strip()
+    branch = head[len("ref: refs/heads/"):] if head.startswith("ref: refs/heads/") else None
+    local = read_ref(common, f"refs/heads/{branch}") if branch else head
+    upstream = read_ref(common, f"refs/remotes/origin/{branch}") if branch else None
+
+    # Only the ref-derived counts are cached; the working tree state always comes
+    # from `git status`, which uses git's own stat cache to stay fast
+    stamp = [local, upstream]
+    cached = cache.get(str(path))
+    if cached and cached["stamp"] == stamp:
+        ahead, behind = cached["ahead"], cached["behind"]
+    elif upstream is None or local == upstream:
+        ahead = behind = 0 if upstream else None
+    else:
+        counts = _git(path, "rev-list", "--left-right", "--count", f"{local}...{upstream}").split()
+        ahead, behind = (int(counts[0]), int(counts[1])) if len(counts) == 2 else (None, None)
+    cache[str(path)] = {"stamp": stamp, "ahead": ahead, "behind": behind}
+
+    changes = _git(path, "status", "--porcelain").splitlines()
+    return {
+        "dir": str(path),
+        "branch": branch or head[:8],
+        "default": branch == default_branch(common),
+        "changes": len(changes),
+        "ahead": ahead,
+        "behind": behind,
+    }
+
+
+def status_cache_file() -> Path:
+    return config_path("status-cache.json")
+
+
+# ---------------- Key filters ---------------- #
+# Expressions over shortcut keys, e.g. "repo & dir", "dir & !frontend", "(a | b) & dir"
+
+def parse_key_filter(expr: str):
+    """Compile a key filter expression into a predicate over a project's shortcuts."""
+    tokens = re.findall(r"[&|!()]|[^\s&|!()]+", expr)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or():
+        left = parse_and()
+        while peek() == "|":
+            take()
+            left = (lambda l, r: lambda e: l(e) or r(e))(left, parse_and())
+        return left
+
+    def parse_and():
+        left = parse_not()
+        while peek() == "&":
+            take()
+            left = (lambda l, r: lambda e: l(e) and r(e))(left, parse_not())
+        return left
+
+    def parse_not():
+        if peek() == "!":
+            take()
+            inner = parse_not()
+            return lambda e: not inner(e)
+        if peek() == "(":
+            take()
+            inner = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Missing ')' in filter: {expr}")
+            take()
+            return inner
+        tok = peek()
+        if tok is None or tok in "&|)":
+            raise ValueError(f"Expected a key in filter: {expr}")
+        key = take()
+        return lambda e: key in e
+
+    pred = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected '{peek()}' in filter: {expr}")
+    return pred
 
 
 # ---------------- Commands ---------------- #
 
 def cmd_add(args):
     d = load_data()
+    projects = d["projects"]
     name = args.name
-    if name in d:
+    if name in projects:
         if args.force:
             pass
         else:
             print(f"Project '{name}' already exists. Use --force to overwrite.", file=sys.stderr)
             sys.exit(1)
-    d.setdefault("active-project", d.get("active-project") or name)
-    d[name] = d.get(name, {})
+    before = projects.get(name)
+    active = d["meta"].get("active-project")
+    projects[name] = projects.get(name, {})
+    d["meta"]["active-project"] = name
     save_data(d)
-    select_project(name)
+    changes = {name: [None, {}]} if before is None else {}
+    if changes or active != name:
+        journal_append(f"add {name}", changes, [active, name])
     print(f"Added project '{name}'. Active = {name}")
 
 
 def cmd_list(args):
     d = load_data()
-    active = d.get("active-project")
-    projects = d.keys()
+    active = d["meta"].get("active-project")
+    projects = d["projects"]
+    if args.tag:
+        projects = {k: projects[k] for k in projects_with_tags(d, args.tag)}
 
     # If a key is specified, filter projects that contain that key
     if hasattr(args, 'key') and args.key:
         inverted = args.key.startswith("!")
 
         if inverted: args.key = args.key[1:]
-        filtered_projects = set([p for p in projects if args.key in d.get(p, {})])
+        filtered_projects = set([p for p, entries in projects.items() if args.key in entries])
 
         if not filtered_projects:
             print(f"No projects found with key '{args.key}'.")
@@ -113,52 +271,289 @@ def cmd_list(args):
         return
 
     if not projects:
-        print("No projects yet. Add one with `project add <name>`.")
+        if args.tag:
+            print(f"No projects tagged {' and '.join(args.tag)}.")
+        else:
+            print("No projects yet. Add one with `project add <name>`.")
         return
 
     for k in sorted(projects):
         star = "*" if k == active and DEBUG else " "
-        count = len(d.get(k, {}))
+        count = len(projects[k])
         print(f"{star} {k} ({count} shortcut{'s' if count != 1 else ''})")
 
     print(len(projects))
 
 def cmd_rename(args):
     d = load_data()
+    projects = d["projects"]
     old, new = args.old, args.new
-    if old not in d:
+    if old not in projects:
         print(f"No such project: {old}", file=sys.stderr)
         sys.exit(1)
-    if new in d and not args.force:
+    if new in projects and not args.force:
         print(f"Project '{new}' already exists. Use --force to overwrite.", file=sys.stderr)
         sys.exit(1)
-    d[new] = d.pop(old)
-    if d.get("active-project") == old:
-        d["active-project"] = new
+    changes = {old: [projects[old], None], new: [projects.get(new), projects[old]]}
+    active = d["meta"].get("active-project")
+    projects[new] = projects.pop(old)
+    if active == old:
+        d["meta"]["active-project"] = new
+    tag_changes = retag_project(d, old, new)
     save_data(d)
+    journal_append(f"rename {old} {new}", changes, [active, d["meta"]["active-project"]], tag_changes)
     print(f"Renamed '{old}' -> '{new}'")
 
 
 def cmd_remove(args):
     d = load_data()
+    projects = d["projects"]
     name = args.name
-    if name not in d:
+    if name not in projects:
         print(f"No such project: {name}", file=sys.stderr)
         sys.exit(1)
     if not args.yes:
-        resp = input(f"Delete project '{name}'? This cannot be undone. [y/N] ").strip().lower()
+        resp = input(f"Delete project '{name}'? (`project undo` restores it) [y/N] ").strip().lower()
         if resp != "y":
             print("Aborted.")
             return
-    del d[name]
-    if d.get("active-project") == name:
-        d["active-project"] = next((k for k in d.keys() if k != "active-project"), None)
+    before = projects.pop(name)
+    active = d["meta"].get("active-project")
+    if active == name:
+        d["meta"]["active-project"] = next(iter(projects), None)
+    tag_changes = retag_project(d, name)
+    save_data(d)
+    journal_append(f"remove {name}", {name: [before, None]}, [active, d["meta"]["active-project"]], tag_changes)
+    print(f"Removed '{name}'. Active = {d['meta'].get('active-project')}")
+
+
+def cmd_tag(args):
+    d = load_data()
+    if args.tag_cmd == "list":
+        for tag in sorted(d.get("tags", {})):
+            print(f"{tag} ({len(d['tags'][tag])})")
+        return
+
+    missing = [p for p in args.projects if p not in d["projects"]]
+    if missing:
+        print(f"No such project: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+    tags = d.setdefault("tags", {})
+    before = tags.get(args.tag)
+    members = set(before or [])
+    members = members | set(args.projects) if args.tag_cmd == "add" else members - set(args.projects)
+    after = sorted(members) or None
+    if after == before:
+        return
+    if after:
+        tags[args.tag] = after
+    else:
+        del tags[args.tag]
     save_data(d)
-    print(f"Removed '{name}'. Active = {d.get('active-project')}")
+    journal_append(f"tag {args.tag_cmd} {args.tag} {' '.join(args.projects)}", {}, tags={args.tag: [before, after]})
+    print(f"Tag '{args.tag}': {len(after or [])} project(s)")
+
+
+def cmd_relocate(args):
+    try:
+        src = resolve_dir(args.src).rstrip(os.sep)
+        dst = resolve_dir(args.dst).rstrip(os.sep)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    d = load_data()
+    changes = {}
+    for name, entries in d["projects"].items():
+        before = None
+        for key, val in entries.items():
+            if val.startswith("http"):
+                continue
+            path = expand_path(val)
+            if path != src and not path.startswith(src + os.sep):
+                continue
+            new_val = portable_path(dst + path[len(src):])
+            if new_val != val:
+                before = before or dict(entries)
+                entries[key] = new_val
+                print(f"{name}.{key}: {val} -> {new_val}")
+        if before is not None:
+            changes[name] = [before, entries]
+    if not changes:
+        print(f"No directory shortcuts under {src}.")
+        return
+    if args.dry_run:
+        print(f"Would update {len(changes)} project(s).")
+        return
+    save_data(d)
+    journal_append(f"relocate {args.src} {args.dst}", changes)
+    print(f"Updated {len(changes)} project(s).")
+
+
+def cmd_undo(args):
+    entries = read_journal()
+    if args.n < 1 or args.n > len(entries):
+        print(f"Cannot undo {args.n} operation(s); history has {len(entries)}.", file=sys.stderr)
+        sys.exit(1)
+    d = load_data()
+    projects = d["projects"]
+    undone = entries[-args.n:]
+    for e in reversed(undone):
+        for name, (before, after) in e["changes"].items():
+            if projects.get(name) != after and not args.force:
+                print(f"Project '{name}' changed outside of '{e['op']}'. Use --force to undo anyway.",
+                      file=sys.stderr)
+                sys.exit(1)
+            if before is None:
+                projects.pop(name, None)
+            else:
+                projects[name] = before
+        if "active" in e:
+            d["meta"]["active-project"] = e["active"][0]
+        tags = d.setdefault("tags", {})
+        for tag, (before, after) in e.get("tags", {}).items():
+            if before is None:
+                tags.pop(tag, None)
+            else:
+                tags[tag] = before
+    save_data(d)
+    write_journal(entries[:-args.n])
+    for e in reversed(undone):
+        print(f"Undid: {e['op']}")
+
+
+def cmd_history(args):
+    entries = read_journal()
+    if not entries:
+        print("No history.")
+        return
+    shown = entries[-args.n:]
+    for i, e in enumerate(reversed(shown), start=1):
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["ts"]))
+        print(f"{i:>3}  {ts}  {e['op']}")
+
+
+def cmd_status(args):
+    d = load_data()
+    targets = {name: entries["dir"] for name, entries in d["projects"].items() if entries.get("dir")}
+
+    cache = {}
+    cache_path = status_cache_file()
+    if cache_path.exists() and not args.refresh:
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            cache = {}
+
+    def scan(name):
+        try:
+            return name, repo_status(Path(resolve_dir(targets[name])), cache)
+        except (OSError, RuntimeError, ValueError) as e:
+            return name, {"dir": str(targets[name]), "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = dict(pool.map(scan, sorted(targets)))
+
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(cache_path)
+
+    if args.dirty:
+        results = {k: v for k, v in results.items() if v.get("changes")}
+    if args.behind:
+        results = {k: v for k, v in results.items() if v.get("behind")}
+    if args.off_default:
+        results = {k: v for k, v in results.items() if "branch" in v and not v["default"]}
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    width = max((len(k) for k in results), default=0)
+    for name, st in results.items():
+        if "error" in st:
+            print(f"{name:<{width}}  !! {st['error']}")
+            continue
+        flags = []
+        if st["changes"]:
+            flags.append(f"{st['changes']} changed")
+        if st["ahead"]:
+            flags.append(f"ahead {st['ahead']}")
+        if st["behind"]:
+            flags.append(f"behind {st['behind']}")
+        if st["ahead"] is None:
+            flags.append("no upstream")
+        branch = st["branch"] if st["default"] else f"{st['branch']} (not default)"
+        print(f"{name:<{width}}  {branch}  {', '.join(flags) or 'clean'}")
+    print(len(results))
+
+
+def cmd_exec(args):
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        print("Nothing to run. Usage: project exec [--filter EXPR] [-j N] -- <cmd>", file=sys.stderr)
+        sys.exit(1)
+    try:
+        pred = parse_key_filter(args.filter)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    # Resolved once from a single load; the active project is never touched
+    d = load_data()
+    tagged = projects_with_tags(d, args.tag) if args.tag else d["projects"]
+    targets = {name: entries["dir"] for name, entries in sorted(d["projects"].items())
+               if name in tagged and "dir" in entries and pred(entries)}
+    if not targets:
+        print(f"No projects match '{args.filter}'{' with tags ' + ', '.join(args.tag) if args.tag else ''}.")
+        return
+
+    width = max(len(k) for k in targets)
+    lock = threading.Lock()
+
+    def run(name):
+        start = time.monotonic()
+        try:
+            cwd = resolve_dir(targets[name])
+        except ValueError as e:
+            with lock:
+                print(f"{name:<{width}} | {e}")
+            return name, 1, time.monotonic() - start
+        try:
+            proc = subprocess.Popen(command[0] if len(command) == 1 else command, shell=len(command) == 1,
+                                    cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    stdin=subprocess.DEVNULL, text=True, errors="replace",
+                                    env={**os.environ, "PROJECT": name})
+        except OSError as e:
+            with lock:
+                print(f"{name:<{width}} | {e}")
+            return name, 127, time.monotonic() - start
+        for line in proc.stdout:
+            with lock:
+                print(f"{name:<{width}} | {line.rstrip()}", flush=True)
+        return name, proc.wait(), time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(run, targets))
+
+    print()
+    failed = 0
+    for name, code, elapsed in results:
+        failed += code != 0
+        print(f"{'ok ' if code == 0 else 'ERR'} {name:<{width}}  exit={code}  {elapsed:.1f}s")
+    print(f"{len(results) - failed} succeeded, {failed} failed")
+    if failed:
+        sys.exit(1)
 
 
 # ---------------- Argparse ---------------- #
 
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return n
+
+
 def build_parser():
     p = argparse.ArgumentParser(prog="project", add_help=False)
     sub = p.add_subparsers(dest="cmd")
@@ -172,6 +567,7 @@ def build_parser():
     # list
     p_list = sub.add_parser("list", help="List projects")
     p_list.add_argument("key", nargs="?", help="Filter projects by key (optional)")
+    p_list.add_argument("--tag", action="append", help="Only projects with this tag (repeat to require several)")
     p_list.set_defaults(func=cmd_list)
 
     # rename
@@ -187,12 +583,61 @@ def build_parser():
     p_rm.add_argument("-y", "--yes", action="store_true", help="Skip confirmation")
     p_rm.set_defaults(func=cmd_remove)
 
+    # tag
+    p_tag = sub.add_parser("tag", help="Group projects with tags")
+    tag_sub = p_tag.add_subparsers(dest="tag_cmd", required=True)
+    for name, help_text in (("add", "Tag projects"), ("remove", "Untag projects")):
+        p_t = tag_sub.add_parser(name, help=help_text)
+        p_t.add_argument("tag")
+        p_t.add_argument("projects", nargs="+")
+    tag_sub.add_parser("list", help="List tags with project counts")
+    p_tag.set_defaults(func=cmd_tag)
+
+    # relocate
+    p_reloc = sub.add_parser("relocate", help="Rewrite directory shortcuts under one path to another")
+    p_reloc.add_argument("--from", dest="src", required=True, help="Old directory prefix")
+    p_reloc.add_argument("--to", dest="dst", required=True, help="New directory prefix")
+    p_reloc.add_argument("--dry-run", action="store_true", help="Only show what would change")
+    p_reloc.set_defaults(func=cmd_relocate)
+
+    # undo
+    p_undo = sub.add_parser("undo", help="Undo the last N changes")
+    p_undo.add_argument("n", nargs="?", type=int, default=1)
+    p_undo.add_argument("--force", action="store_true", help="Undo even if the store was changed since")
+    p_undo.set_defaults(func=cmd_undo)
+
+    # history
+    p_hist = sub.add_parser("history", help="Show recent changes (newest first)")
+    p_hist.add_argument("-n", type=int, default=20, help="Number of entries to show")
+    p_hist.set_defaults(func=cmd_history)
+
+    # status
+    p_st = sub.add_parser("status", help="Git status of every project with a 'dir' shortcut")
+    p_st.add_argument("--dirty", action="store_true", help="Only projects with uncommitted changes")
+    p_st.add_argument("--behind", action="store_true", help="Only projects behind their upstream")
+    p_st.add_argument("--off-default", action="store_true", help="Only projects not on the default branch")
+    p_st.add_argument("--json", action="store_true", help="Print results as JSON")
+    p_st.add_argument("--refresh", action="store_true", help="Recompute cached ahead/behind counts")
+    p_st.add_argument("-j", "--jobs", type=positive_int, default=min(32, (os.cpu_count() or 1) * 4),
+                      help="Number of repositories scanned in parallel")
+    p_st.set_defaults(func=cmd_status)
+
+    # exec
+    p_exec = sub.add_parser("exec", help="Run a command in the 'dir' of every matching project")
+    p_exec.add_argument("--filter", default="dir",
+                        help="Shortcut key expression, e.g. 'repo & dir' or 'dir & !frontend'")
+    p_exec.add_argument("--tag", action="append", help="Only projects with this tag (repeatable)")
+    p_exec.add_argument("-j", "--jobs", type=positive_int, default=os.cpu_count() or 1,
+                        help="Number of commands run in parallel")
+    p_exec.add_argument("command", nargs=argparse.REMAINDER, help="-- <cmd> [args...]")
+    p_exec.set_defaults(func=cmd_exec)
+
     # active
     p_act = sub.add_parser("active", help="Show active project")
 
     def show_active(_):
         d = load_data()
-        print(d.get("active-project") or "<none>")
+        print(d["meta"].get("active-project") or "<none>")
 
     p_act.set_defaults(func=show_active)
 
@@ -201,10 +646,10 @@ def build_parser():
 
 def select_project(name: str):
     d = load_data()
-    if name not in d:
+    if name not in d["projects"]:
         print(f"No such project: {name}", file=sys.stderr)
         sys.exit(1)
-    d["active-project"] = name
+    d["meta"]["active-project"] = name
     save_data(d)
     if DEBUG: print(f"Selected active project: {name}")
 
@@ -0,0 +1,242 @@
+"""Storage layer shared by the `project` and `goto` CLIs.
+
+Holds the projects.json schema and (de)serialization, portable path
+handling, the derived-data cache and the undo journal. install.sh copies
+this module next to the installed commands.
+"""
+import json
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used as fallback
+    orjson = None
+
+CONFIG_DIR = Path.home() / ".project-cli"
+DATA_FILE = CONFIG_DIR / "projects.json"
+
+SCHEMA_VERSION = 2
+# "pretty" (indented, hand-editable) or "compact" (smaller, faster to dump/parse)
+STORE_FORMAT = os.environ.get("PROJECT_CLI_FORMAT", "pretty")
+# Environment variables whose paths are used as roots for stored directories
+# ("$REPO/svc-a"), besides "~". Set e.g. PROJECT_CLI_ROOTS="REPO:WORK".
+PATH_ROOTS = os.environ.get("PROJECT_CLI_ROOTS", "REPO").split(":")
+# Oldest journal entries are dropped once the journal grows past this many bytes
+JOURNAL_MAX_BYTES = 1024 * 1024
+
+
+# ---------------- Paths ---------------- #
+
+@lru_cache(maxsize=None)
+def expand_path(p: str) -> str:
+    return os.path.expanduser(os.path.expandvars(p))
+
+
+def resolve_dir(p: str) -> str:
+    """Absolute path for `p` with ~ and $VARs expanded. Raises ValueError for unset variables."""
+    expanded = expand_path(p)
+    unset = re.search(r"\$(\w+|\{\w+\})", expanded)
+    if unset:
+        raise ValueError(f"Environment variable {unset.group(0)} in '{p}' is not set.")
+    return os.path.abspath(expanded)
+
+
+def portable_path(p: str) -> str:
+    """Absolute path for `p`, rewritten relative to the longest matching root ($VAR or ~)."""
+    p = resolve_dir(p)
+    roots = [(f"${name}", os.environ[name]) for name in PATH_ROOTS if os.environ.get(name)]
+    roots.append(("~", str(Path.home())))
+    roots = [(name, os.path.abspath(os.path.expanduser(root)).rstrip(os.sep)) for name, root in roots]
+    for name, root in sorted(roots, key=lambda r: len(r[1]), reverse=True):
+        if root and (p == root or p.startswith(root + os.sep)):
+            return name + p[len(root):]
+    return p
+
+
+# ---------------- Store ---------------- #
+
+def empty_store() -> dict:
+    return {"meta": {"version": SCHEMA_VERSION, "active-project": None}, "projects": {}, "tags": {}}
+
+
+def migrate(d: dict) -> bool:
+    """Upgrade a loaded store to SCHEMA_VERSION in place. Returns True if it changed."""
+    meta = d.get("meta")
+    if isinstance(meta, dict) and "projects" in d:
+        version = meta.get("version", SCHEMA_VERSION)
+        if version > SCHEMA_VERSION:
+            print(f"Error: {DATA_FILE} has schema version {version}, this tool supports {SCHEMA_VERSION}.",
+                  file=sys.stderr)
+            sys.exit(1)
+        # Already in the meta/projects layout: a missing version is stamped, never re-nested
+        if meta.get("version") == SCHEMA_VERSION:
+            return False
+        meta["version"] = SCHEMA_VERSION
+        return True
+    # v1: flat dict of projects with "active-project" stored beside them
+    active = d.pop("active-project", None)
+    projects = dict(d)
+    d.clear()
+    d.update(empty_store())
+    d["projects"] = projects
+    d["meta"]["active-project"] = active
+    return True
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _dumps(d: dict) -> bytes:
+    compact = STORE_FORMAT == "compact"
+    if orjson is not None:
+        return orjson.dumps(d) if compact else orjson.dumps(d, option=orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(d, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(d, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _stamp(st) -> list:
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def read_store():
+    """Load the store. Returns (store, stamp of the file that was read, or None)."""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        f = DATA_FILE.open("rb")
+    except FileNotFoundError:
+        return empty_store(), None
+    with f:
+        stamp = _stamp(os.fstat(f.fileno()))
+        raw = f.read()
+    try:
+        d = _loads(raw)
+    except json.JSONDecodeError:
+        print(f"Error: {DATA_FILE} is not valid JSON.")
+        sys.exit(1)
+    if migrate(d):
+        stamp = save_data(d)
+    return d, stamp
+
+
+def load_data() -> dict:
+    return read_store()[0]
+
+
+def save_data(d: dict) -> list:
+    """Atomically replace the store with `d`. Returns the stamp of the written file."""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    d["meta"]["generation"] = d["meta"].get("generation", 0) + 1
+    tmp = DATA_FILE.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        f.write(_dumps(d))
+        f.flush()
+        stamp = _stamp(os.fstat(f.fileno()))
+    tmp.replace(DATA_FILE)
+    return stamp
+
+
+# ---------------- Derived artifacts ---------------- #
+# Completion lists and other data computed from the store are cached next to it
+# and reused while the store's (mtime, size, inode) is unchanged, so checking for
+# staleness is a single stat() and also catches hand edits. save_data() replaces
+# the file (new inode) and bumps meta.generation on every write.
+
+def store_stamp():
+    try:
+        return _stamp(DATA_FILE.stat())
+    except FileNotFoundError:
+        return None
+
+
+def config_path(name: str) -> Path:
+    """Path of a file kept next to the store (journal, caches)."""
+    return DATA_FILE.with_name(name)
+
+
+def derived(name: str, build):
+    """Return build(store), cached in cache/<name>.json until the store changes."""
+    path = config_path("cache") / f"{name}.json"
+    stamp = store_stamp()
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+        if cached["stamp"] == stamp:
+            return cached["value"]
+    except (OSError, ValueError, KeyError):
+        pass
+    # Stamp with the file actually read, so a concurrent write can't be cached as current
+    d, stamp = read_store()
+    value = build(d)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"stamp": stamp, "value": value}, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass  # caching is best effort
+    return value
+
+
+# ---------------- Journal ---------------- #
+# One JSON line per mutation holding only the touched projects (and tags):
+#   {"ts": ..., "op": "...", "changes": {name: [before, after]}, "active": [before, after],
+#    "tags": {tag: [before, after]}}
+# where a missing project or tag is null. Undo applies "before" values newest first.
+
+def journal_file() -> Path:
+    return config_path("journal.jsonl")
+
+
+def read_journal() -> list:
+    path = journal_file()
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_journal(entries: list) -> None:
+    path = journal_file()
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for e in entries:
+            f.write(json.dumps(e, separators=(",", ":"), ensure_ascii=False) + "\n")
+    tmp.replace(path)
+
+
+def journal_append(op: str, changes: dict, active: list = None, tags: dict = None) -> None:
+    entry = {"ts": time.time(), "op": op, "changes": changes}
+    if active and active[0] != active[1]:
+        entry["active"] = active
+    if tags:
+        entry["tags"] = tags
+    path = journal_file()
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+    if path.stat().st_size > JOURNAL_MAX_BYTES:
+        trim_journal(path)
+
+
+def trim_journal(path: Path) -> None:
+    # Keep the newest entries fitting in half the cap, so trimming is rare. The newest
+    # entry is always kept, even when it alone is over the cap, so it can be undone.
+    with path.open("r", encoding="utf-8") as f:
+        lines = f.readlines()
+    kept, size = [], 0
+    for line in reversed(lines):
+        size += len(line.encode("utf-8"))
+        if kept and size > JOURNAL_MAX_BYTES // 2:
+            break
+        kept.append(line)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.writelines(reversed(kept))
+    tmp.replace(path)
@@ -1,22 +1,14 @@
 #!/usr/bin/env python3
 
 import sys
-import webbrowser
-from urllib.parse import urlparse
+
+from repo_urls import parse_cached
 
 
 def extract_workspace_and_repo(bitbucket_url):
     # Handles URLs like: https://domain/projects/<workspace>/repos/<repo>/browse
-    path = urlparse(bitbucket_url).path.strip('/')
-    parts = path.split('/')
-    try:
-        workspace_idx = parts.index('projects') + 1
-        repo_idx = parts.index('repos') + 1
-        workspace = parts[workspace_idx]
-        repo = parts[repo_idx]
-    except (ValueError, IndexError):
-        raise ValueError("Bitbucket URL must be in the format: https://domain/projects/<workspace>/repos/<repo>/browse")
-    return workspace, repo
+    info = parse_cached(bitbucket_url)
+    return info["workspace"], info["repo"]
 
 
 def main():
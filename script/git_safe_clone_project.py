@@ -2,6 +2,8 @@ import sys
 import subprocess
 import os
 
+from repo_urls import parse_cached
+
 
 def run_cmd(cmd):
     result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
@@ -9,13 +11,7 @@ def run_cmd(cmd):
 
 
 def convert_clone_url(repo_url: str) -> str:
-    clone_url = repo_url \
-        .replace('.no/projects/', '.no/scm/') \
-        .replace('/repos/', '/')
-
-    if clone_url.endswith("/"): clone_url = clone_url[:-1]
-    clone_url = clone_url + ".git"
-    return clone_url
+    return parse_cached(repo_url)["clone_url"]
 
 
 def main():
@@ -1,8 +1,9 @@
-import re
 import subprocess
 import os
 from pathlib import Path
 
+from repo_urls import RepoUrlCache
+
 def read_repo_env(env_path='.env'):
     repo_path = None
     with open(env_path, 'r') as f:
@@ -14,16 +15,19 @@ def read_repo_env(env_path='.env'):
     return repo_path
 
 repo = read_repo_env()
+urls = RepoUrlCache()
 
 with open('urls.txt', 'r') as file:
     for line in file:
         url = line.strip()
         if not url: continue
-        if url.endswith('/browse'):
-            url = url[:-6]
-        match = re.search(r'repos\/(.*?)\/', url)
-        if match:
-            project = match.group(1)
-            # subprocess.run(f"project add {project}".split(" "))
-            subprocess.run(f"project {project}".split(" "))
-            subprocess.run(f"goto update repo {url}".split(" "))
+        try:
+            info = urls.get(url)
+        except ValueError:
+            continue
+        project = info["repo"]
+        # subprocess.run(f"project add {project}".split(" "))
+        subprocess.run(f"project {project}".split(" "))
+        subprocess.run(f"goto update repo {info['web_url']}".split(" "))
+
+urls.save()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Parse and cache the `repo` URLs stored in projects.json.
+
+Every `repo` shortcut is normalized once into its components
+(provider, host, workspace, repo, web_url, clone_url). Results are kept in
+~/.project-cli/repo-urls.json keyed by a hash of the URL, so the clone,
+Jenkins and import scripts don't re-parse the same URLs.
+
+Provider rules can be extended in ~/.project-cli/providers.json, mapping a
+host to one of the providers below, e.g. {"git.example.no": "bitbucket-server"}.
+
+Usage:
+    repo_urls.py                 # list project -> workspace/repo
+    repo_urls.py --json          # all parsed components as JSON
+    repo_urls.py --field clone_url
+"""
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+
+# project_store.py lives in the repo root and is installed next to `project`/`goto`
+for _dir in (Path(__file__).resolve().parent.parent, Path(shutil.which("project") or __file__).resolve().parent):
+    if str(_dir) not in sys.path:
+        sys.path.append(str(_dir))
+
+import project_store  # noqa: E402
+
+CONFIG_DIR = project_store.CONFIG_DIR
+CACHE_FILE = CONFIG_DIR / "repo-urls.json"
+PROVIDERS_FILE = CONFIG_DIR / "providers.json"
+# Bump when the parsed fields change so older sidecar entries are discarded
+CACHE_VERSION = 2
+
+DEFAULT_HOSTS = {
+    "github.com": "github",
+    "gitlab.com": "gitlab",
+    "bitbucket.org": "bitbucket-cloud",
+}
+
+
+# ---------------- Providers ---------------- #
+# Each provider parser takes the URL path parts and returns (workspace, repo) or raises ValueError.
+
+def _bitbucket_server(parts):
+    # /projects/<workspace>/repos/<repo>[/browse...] or /scm/<workspace>/<repo>.git
+    if "projects" in parts and "repos" in parts:
+        return parts[parts.index("projects") + 1], parts[parts.index("repos") + 1]
+    if parts[:1] == ["scm"] and len(parts) >= 3:
+        return parts[1], parts[2]
+    raise ValueError
+
+
+def _owner_repo(parts):
+    # /<owner>/<repo>[/tree/...]
+    if len(parts) < 2:
+        raise ValueError
+    return parts[0], parts[1]
+
+
+def _gitlab(parts):
+    # /<group>/<subgroup...>/<repo>[/-/tree/...]
+    if "-" in parts:
+        parts = parts[:parts.index("-")]
+    if len(parts) < 2:
+        raise ValueError
+    return "/".join(parts[:-1]), parts[-1]
+
+
+PROVIDERS = {
+    "bitbucket-server": {
+        "parse": _bitbucket_server,
+        "web": "https://{netloc}/projects/{workspace}/repos/{repo}",
+        "clone": "https://{netloc}/scm/{workspace}/{repo}.git",
+    },
+    "bitbucket-cloud": {
+        "parse": _owner_repo,
+        "web": "https://{netloc}/{workspace}/{repo}",
+        "clone": "https://{netloc}/{workspace}/{repo}.git",
+    },
+    "github": {
+        "parse": _owner_repo,
+        "web": "https://{netloc}/{workspace}/{repo}",
+        "clone": "https://{netloc}/{workspace}/{repo}.git",
+    },
+    "gitlab": {
+        "parse": _gitlab,
+        "web": "https://{netloc}/{workspace}/{repo}",
+        "clone": "https://{netloc}/{workspace}/{repo}.git",
+    },
+}
+
+
+def load_host_rules():
+    rules = dict(DEFAULT_HOSTS)
+    if PROVIDERS_FILE.exists():
+        with PROVIDERS_FILE.open("r", encoding="utf-8") as f:
+            rules.update(json.load(f))
+    return rules
+
+
+def detect_provider(host, parts, rules):
+    if host in rules:
+        if rules[host] not in PROVIDERS:
+            raise ValueError(f"Unknown provider '{rules[host]}' for {host}; use one of {', '.join(PROVIDERS)}")
+        return rules[host]
+    if "projects" in parts and "repos" in parts or parts[:1] == ["scm"]:
+        return "bitbucket-server"
+    raise ValueError(f"Unknown repository host: {host}")
+
+
+def parse_repo_url(url, rules=None):
+    """Split a repository URL into provider, host, workspace, repo, web_url and clone_url."""
+    rules = load_host_rules() if rules is None else rules
+    parsed = urlparse(url.strip())
+    # Rules match the bare host name; userinfo (git@) and ports are not part of it
+    host = parsed.hostname or ""
+    parts = [p for p in parsed.path.split("/") if p]
+    provider = detect_provider(host, parts, rules)
+    try:
+        workspace, repo = PROVIDERS[provider]["parse"](parts)
+    except (ValueError, IndexError):
+        raise ValueError(f"Cannot parse {provider} repository URL: {url}")
+    if repo.endswith(".git"):
+        repo = repo[:-4]
+    # The generated URLs are https, so only an http(s) port carries over (not e.g. ssh's 7999)
+    netloc = f"{host}:{parsed.port}" if parsed.port and parsed.scheme in ("http", "https") else host
+    fields = {"host": host, "workspace": workspace, "repo": repo}
+    return {
+        "provider": provider,
+        **fields,
+        "web_url": PROVIDERS[provider]["web"].format(netloc=netloc, **fields),
+        "clone_url": PROVIDERS[provider]["clone"].format(netloc=netloc, **fields),
+    }
+
+
+# ---------------- Sidecar cache ---------------- #
+
+def url_key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class RepoUrlCache:
+    """Parsed URL components keyed by URL hash, invalidated when the host rules change."""
+
+    def __init__(self):
+        self.rules = load_host_rules()
+        self.rules_key = url_key(json.dumps([CACHE_VERSION, self.rules], sort_keys=True))
+        self.entries = {}
+        self.dirty = False
+        if CACHE_FILE.exists():
+            try:
+                with CACHE_FILE.open("r", encoding="utf-8") as f:
+                    cached = json.load(f)
+            except ValueError:
+                cached = {}
+            if cached.get("rules") == self.rules_key:
+                self.entries = cached.get("urls", {})
+
+    def get(self, url):
+        key = url_key(url)
+        if key not in self.entries:
+            self.entries[key] = parse_repo_url(url, self.rules)
+            self.dirty = True
+        return self.entries[key]
+
+    def save(self):
+        if not self.dirty:
+            return
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"rules": self.rules_key, "urls": self.entries}, f, separators=(",", ":"))
+        tmp.replace(CACHE_FILE)
+        self.dirty = False
+
+
+def parse_cached(url):
+    """Parse a single URL through the sidecar cache."""
+    cache = RepoUrlCache()
+    result = cache.get(url)
+    cache.save()
+    return result
+
+
+def enrich_projects(projects=None):
+    """Parse every project's `repo` shortcut in one pass. Returns ({project: components}, errors)."""
+    projects = project_store.load_data()["projects"] if projects is None else projects
+    cache = RepoUrlCache()
+    result, errors = {}, {}
+    for name, entries in projects.items():
+        url = entries.get("repo")
+        if not url:
+            continue
+        try:
+            result[name] = cache.get(url)
+        except ValueError as e:
+            errors[name] = str(e)
+    cache.save()
+    return result, errors
+
+
+def main():
+    p = argparse.ArgumentParser(prog="repo_urls.py")
+    p.add_argument("--json", action="store_true", help="Print all parsed components as JSON")
+    p.add_argument("--field", choices=["provider", "host", "workspace", "repo", "web_url", "clone_url"],
+                   help="Print only this component per project")
+    args = p.parse_args()
+
+    result, errors = enrich_projects()
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for name in sorted(result):
+            info = result[name]
+            value = info[args.field] if args.field else f"{info['workspace']}/{info['repo']}"
+            print(f"{name}: {value}")
+    for name, err in sorted(errors.items()):
+        print(f"{name}: {err}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
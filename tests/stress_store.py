@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Concurrency stress harness for the project/goto store.
+
+Runs many concurrent `goto`/`project` processes with a mix of reads and
+writes against a throwaway HOME, then checks the store:
+  - projects.json is valid JSON with the current schema
+  - the active project exists
+  - no lost updates: every add that exited 0 is present
+  - no crashes (uncaught tracebacks) and no unexpected error exits
+and reports throughput and latency percentiles per store size.
+
+Not collected by pytest; run it directly:
+    python tests/stress_store.py --sizes 10,1000,10000 --workers 16 --ops 40
+Exits 1 if any invariant is violated.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GOTO = [sys.executable, str(ROOT / "goto_cli.py")]
+PROJECT = [sys.executable, str(ROOT / "project_cli.py")]
+
+
+def seed_store(home: Path, size: int) -> None:
+    config = home / ".project-cli"
+    config.mkdir(parents=True)
+    projects = {f"seed-{i}": {"repo": f"https://git.example.no/projects/X/repos/seed-{i}", "dir": f"/src/seed-{i}"}
+                for i in range(size)}
+    store = {"meta": {"version": 2, "active-project": "seed-0", "generation": 0}, "projects": projects}
+    (config / "projects.json").write_text(json.dumps(store), encoding="utf-8")
+
+
+def worker(wid: int, args, env: dict, size: int, log: list, lock: threading.Lock) -> None:
+    rnd = random.Random(wid)
+    for i in range(args.ops):
+        if rnd.random() < args.write_ratio:
+            kind = rnd.choice(["project add", "goto add", "select"])
+            if kind == "project add":
+                name = f"w{wid}-{i}"
+                cmd = PROJECT + ["add", name]
+            elif kind == "goto add":
+                name = f"k{wid}-{i}"
+                cmd = GOTO + ["add", name, "/tmp"]
+            else:
+                name = None
+                cmd = PROJECT + [f"seed-{rnd.randrange(size)}"]
+        else:
+            kind = rnd.choice(["project list", "goto list", "project active"])
+            name = None
+            cmd = {"project list": PROJECT + ["list"], "goto list": GOTO + ["list"],
+                   "project active": PROJECT + ["active"]}[kind]
+        start = time.perf_counter()
+        result = subprocess.run(cmd, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        with lock:
+            log.append({"kind": kind, "name": name, "code": result.returncode, "elapsed": elapsed,
+                        "traceback": "Traceback (most recent call last)" in result.stderr,
+                        "stderr": result.stderr.strip()[-200:]})
+
+
+def check_invariants(home: Path, log: list) -> list:
+    errors = []
+    data_file = home / ".project-cli" / "projects.json"
+    try:
+        d = json.loads(data_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        return [f"store unreadable: {e}"]
+    if not isinstance(d.get("meta"), dict) or not isinstance(d.get("projects"), dict):
+        return ["store does not have the meta/projects layout"]
+    projects = d["projects"]
+    active = d["meta"].get("active-project")
+    if active not in projects:
+        errors.append(f"active project {active!r} does not exist")
+
+    keys = {k for entries in projects.values() for k in entries}
+    lost = [e for e in log if e["code"] == 0 and (
+        e["kind"] == "project add" and e["name"] not in projects or
+        e["kind"] == "goto add" and e["name"] not in keys)]
+    if lost:
+        errors.append(f"{len(lost)} lost update(s), e.g. {lost[0]['kind']} {lost[0]['name']}")
+    # Uncaught exceptions also exit with 1, so tell them apart by their traceback
+    crashed = [e for e in log if e["traceback"] or e["code"] < 0]
+    if crashed:
+        errors.append(f"{len(crashed)} process(es) crashed, e.g. {crashed[0]['stderr']!r}")
+    # Adds use unique names, so they should never be refused; exit 2 is "No active project"
+    failed = [e for e in log if e not in crashed and e["code"] != 0 and
+              (e["kind"].endswith(" add") or e["code"] not in (1, 2))]
+    if failed:
+        errors.append(f"{len(failed)} unexpected failure(s), e.g. {failed[0]['kind']}: {failed[0]['stderr']!r}")
+    return errors
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_size(size: int, args) -> bool:
+    home = Path(tempfile.mkdtemp(prefix="project-cli-stress-"))
+    try:
+        seed_store(home, size)
+        env = {**os.environ, "HOME": str(home)}
+        log, lock = [], threading.Lock()
+        threads = [threading.Thread(target=worker, args=(w, args, env, size, log, lock))
+                   for w in range(args.workers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - start
+
+        latencies = [e["elapsed"] * 1000 for e in log]
+        errors = check_invariants(home, log)
+        print(f"size={size:<7} ops={len(log):<5} {len(log) / wall:7.1f} ops/s  "
+              f"p50={percentile(latencies, 0.5):6.1f}ms  p95={percentile(latencies, 0.95):6.1f}ms  "
+              f"p99={percentile(latencies, 0.99):6.1f}ms  max={max(latencies):6.1f}ms  "
+              f"{'OK' if not errors else 'FAIL'}")
+        for err in errors:
+            print(f"    !! {err}")
+        return not errors
+    finally:
+        if args.keep:
+            print(f"    store kept in {home}")
+        else:
+            shutil.rmtree(home, ignore_errors=True)
+
+
+def main():
+    p = argparse.ArgumentParser(prog="stress_store.py")
+    p.add_argument("--sizes", default="10,1000,10000", help="Comma separated number of seeded projects")
+    p.add_argument("--workers", type=int, default=16, help="Concurrent client loops")
+    p.add_argument("--ops", type=int, default=40, help="Operations per worker")
+    p.add_argument("--write-ratio", type=float, default=0.3, help="Fraction of operations that write")
+    p.add_argument("--keep", action="store_true", help="Keep the temp store for inspection")
+    args = p.parse_args()
+
+    ok = True
+    for size in (int(s) for s in args.sizes.split(",")):
+        ok &= run_size(size, args)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
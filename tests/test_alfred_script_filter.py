@@ -0,0 +1,91 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import json
+import os
+from unittest import mock
+from pathlib import Path
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'alfred'))
+sys.path.append(parent_dir)
+
+import script_filter
+import project_store
+
+
+class TestAlfredScriptFilter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir)
+        self.data_file = self.config_dir / "projects.json"
+        project_store.CONFIG_DIR = self.config_dir
+        project_store.DATA_FILE = self.data_file
+        script_filter.CACHE_DIR = self.config_dir / "cache"
+        self.init_data({
+            "meta": {"version": 2, "active-project": "alpha"},
+            "projects": {
+                "alpha": {"repo": "https://bb.no/projects/X/repos/alpha", "dir": "/src/alpha"},
+                "alpine": {"repo": "https://bb.no/projects/X/repos/alpine"},
+                "beta": {},
+            },
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def init_data(self, data):
+        with self.data_file.open("w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def titles(self, *args):
+        return [item["title"] for item in script_filter.script_filter(*args)]
+
+    def test_projects_by_key(self):
+        self.assertEqual(self.titles("projects", None, ""), ["alpha", "alpine", "beta"])
+        self.assertEqual(self.titles("projects", "repo", ""), ["alpha", "alpine"])
+        self.assertEqual(self.titles("projects", "!dir", ""), ["alpine", "beta"])
+
+    def test_not_cloned(self):
+        self.assertEqual(self.titles("not-cloned", None, ""), ["alpine"])
+
+    def test_goto_by_type(self):
+        self.assertEqual(self.titles("goto", "url", ""), ["repo"])
+        self.assertEqual(self.titles("goto", "dir", ""), ["dir"])
+
+    def test_incremental_query_filters_prior_matches(self):
+        self.assertEqual(self.titles("projects", None, "al"), ["alpha", "alpine"])
+        with mock.patch.object(script_filter, "build_items") as build:
+            self.assertEqual(self.titles("projects", None, "alp"), ["alpha", "alpine"])
+            self.assertEqual(self.titles("projects", None, "alph"), ["alpha"])
+            self.assertEqual(self.titles("projects", None, "b"), ["beta"])
+        build.assert_not_called()
+
+    def test_store_change_invalidates_cache(self):
+        self.assertEqual(self.titles("projects", None, ""), ["alpha", "alpine", "beta"])
+        self.init_data({"meta": {"version": 2, "active-project": None}, "projects": {"gamma": {}}})
+        self.assertEqual(self.titles("projects", None, ""), ["gamma"])
+
+    def test_goto_unset_root(self):
+        self.init_data({"meta": {"version": 2, "active-project": "a"}, "projects": {"a": {"src": "$REPO_UNSET/a"}}})
+        (item,) = script_filter.script_filter("goto", None, "")
+        self.assertFalse(item["valid"])
+        self.assertIn("$REPO_UNSET", item["subtitle"])
+
+    def test_reads_v1_store(self):
+        self.init_data({"active-project": "old", "old": {"dir": "/src/old"}})
+        self.assertEqual(self.titles("projects", None, ""), ["old"])
+        self.assertEqual(self.titles("goto", "dir", ""), ["dir"])
+
+    def test_emits_compact_json(self):
+        with mock.patch("sys.stdout") as mock_stdout:
+            script_filter.main(["projects", "be"])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertNotIn("\n", output)
+        data = json.loads(output)
+        self.assertNotIn("cache", data)
+        self.assertEqual([i["title"] for i in data["items"]], ["beta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
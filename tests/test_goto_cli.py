@@ -11,6 +11,7 @@ parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
 
 import goto_cli
+import project_store
 
 
 class TestGotoCLI(unittest.TestCase):
@@ -18,12 +19,12 @@ class TestGotoCLI(unittest.TestCase):
         self.temp_dir = tempfile.mkdtemp()
         self.config_dir = Path(self.temp_dir)
         self.data_file = self.config_dir / "projects.json"
-        goto_cli.CONFIG_DIR = self.config_dir
-        goto_cli.DATA_FILE = self.data_file
+        project_store.CONFIG_DIR = self.config_dir
+        project_store.DATA_FILE = self.data_file
         self.config_dir.mkdir(exist_ok=True)
         # Set up a default project
         self.project = "testproj"
-        self.init_data({self.project: {}, "active-project": self.project})
+        self.init_data({"meta": {"version": 2, "active-project": self.project}, "projects": {self.project: {}}})
 
     def tearDown(self):
         shutil.rmtree(self.temp_dir)
@@ -49,7 +50,7 @@ class TestGotoCLI(unittest.TestCase):
         code = self.run_cli(["goto", "add", "foo", "/tmp"])
         self.assertEqual(code, 0)
         data = self.get_data()
-        self.assertIn("foo", data[self.project])
+        self.assertIn("foo", data["projects"][self.project])
 
     # 1b. Add an existing key: expect error
     def test_add_existing_key(self):
@@ -63,7 +64,7 @@ class TestGotoCLI(unittest.TestCase):
         code = self.run_cli(["goto", "update", "foo", "/tmp2"])
         self.assertEqual(code, 0)
         data = self.get_data()
-        self.assertEqual(data[self.project]["foo"], str(Path("/tmp2").absolute()))
+        self.assertEqual(data["projects"][self.project]["foo"], str(Path("/tmp2").absolute()))
 
     # 2b. Update a non-existing key: error
     def test_update_nonexisting_key(self):
@@ -104,13 +105,13 @@ class TestGotoCLI(unittest.TestCase):
         code = self.run_cli(["goto", "rename", "foo", "bar"])
         self.assertEqual(code, 0)
         data = self.get_data()
-        self.assertIn("bar", data[self.project])
-        self.assertNotIn("foo", data[self.project])
+        self.assertIn("bar", data["projects"][self.project])
+        self.assertNotIn("foo", data["projects"][self.project])
 
     # 4b. Rename non-existing key: error
     def test_rename_nonexisting_key(self):
         code = self.run_cli(["goto", "rename", "ghost", "bar"])
-        self.assertRaises(KeyError, lambda: self.get_data()[self.project]["bar"])
+        self.assertRaises(KeyError, lambda: self.get_data()["projects"][self.project]["bar"])
         self.assertNotEqual(code, 0)
 
     # 4c. Rename existing key to another existing key: ERROR
@@ -126,7 +127,7 @@ class TestGotoCLI(unittest.TestCase):
         code = self.run_cli(["goto", "remove", "foo"])
         self.assertEqual(code, 0)
         data = self.get_data()
-        self.assertNotIn("foo", data[self.project])
+        self.assertNotIn("foo", data["projects"][self.project])
 
     # 5b. Remove a non-existing key: ERROR
     def test_remove_nonexisting_key(self):
@@ -145,6 +146,82 @@ class TestGotoCLI(unittest.TestCase):
             output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
         self.assertEqual(output, "")
 
+    # 7. Mutations are journaled with the project's before/after
+    def test_journal(self):
+        self.run_cli(["goto", "add", "foo", "/tmp"])
+        self.run_cli(["goto", "rename", "foo", "bar"])
+        with (self.config_dir / "journal.jsonl").open() as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e["op"] for e in entries], ["goto add foo", "goto rename foo bar"])
+        before, after = entries[1]["changes"][self.project]
+        self.assertEqual(before, {"foo": "/tmp"})
+        self.assertEqual(after, {"bar": "/tmp"})
+
+    # 8. Completion keys are cached until the store changes, including hand edits
+    def test_complete_keys_cache(self):
+        self.run_cli(["goto", "add", "foo", "/tmp"])
+
+        def complete():
+            with mock.patch("sys.stdout") as mock_stdout:
+                self.run_cli(["goto", "--_complete-keys"])
+                return "".join([c[0][0] for c in mock_stdout.write.call_args_list]).split()
+
+        self.assertEqual(complete(), ["foo"])
+        with mock.patch.object(project_store, "read_store") as load:
+            self.assertEqual(complete(), ["foo"])
+        load.assert_not_called()
+        data = self.get_data()
+        data["projects"][self.project]["bar"] = "/tmp"
+        self.init_data(data)
+        self.assertEqual(complete(), ["foo", "bar"])
+        self.assertEqual(data["meta"]["generation"], 1)
+
+    # 9. Directories under a root are stored relative to it and expanded on lookup
+    def test_portable_paths(self):
+        repo = self.config_dir / "repo"
+        with mock.patch.dict(os.environ, {"REPO": str(repo)}):
+            project_store.expand_path.cache_clear()
+            self.run_cli(["goto", "add", "src", str(repo / "svc-a")])
+            self.assertEqual(self.get_data()["projects"][self.project]["src"], "$REPO/svc-a")
+            with mock.patch("sys.stdout") as mock_stdout:
+                self.run_cli(["goto", "src"])
+                output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+            self.assertEqual(output.strip(), str(repo / "svc-a"))
+        project_store.expand_path.cache_clear()
+        with mock.patch.object(Path, "home", return_value=self.config_dir):
+            self.run_cli(["goto", "add", "notes", str(self.config_dir / "notes")])
+        self.assertEqual(self.get_data()["projects"][self.project]["notes"], "~/notes")
+        with mock.patch.dict(os.environ):
+            os.environ.pop("REPO", None)
+            code = self.run_cli(["goto", "add", "bad", "$REPO/svc-b"])
+        self.assertNotEqual(code, 0)
+        self.assertNotIn("bad", self.get_data()["projects"][self.project])
+
+        # A stored root that is unset now fails the lookup instead of printing "$REPO/svc-a"
+        with mock.patch.dict(os.environ), mock.patch("sys.stdout") as mock_stdout, mock.patch("sys.stderr"):
+            os.environ.pop("REPO", None)
+            project_store.expand_path.cache_clear()
+            self.assertEqual(self.run_cli(["goto", "src"]), 1)
+            self.assertEqual(self.run_cli(["goto", "haskey", "src"]), 1)
+            self.assertEqual(self.run_cli(["goto", "list"]), 1)
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertNotIn("$REPO", output)
+        self.assertIn("- notes: ", output)
+        project_store.expand_path.cache_clear()
+
+    # 10. Legacy flat store is upgraded once on load
+    def test_migrates_legacy_store(self):
+        self.init_data({self.project: {"foo": "/tmp"}, "active-project": self.project})
+        with mock.patch("sys.stdout") as mock_stdout:
+            code = self.run_cli(["goto", "haskey", "foo"])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertEqual(code, 0)
+        self.assertIn("/tmp", output)
+        data = self.get_data()
+        self.assertEqual(data["meta"]["version"], 2)
+        self.assertEqual(data["meta"]["active-project"], self.project)
+        self.assertEqual(data["projects"], {self.project: {"foo": "/tmp"}})
+
 
 if __name__ == "__main__":
     unittest.main()
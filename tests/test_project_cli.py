@@ -4,6 +4,7 @@ import shutil
 import sys
 import json
 import os
+import subprocess
 from unittest import mock
 from pathlib import Path
 
@@ -13,6 +14,7 @@ parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
 
 import project_cli
+import project_store
 
 
 class TestProjectCLI(unittest.TestCase):
@@ -21,8 +23,8 @@ class TestProjectCLI(unittest.TestCase):
         self.temp_dir = tempfile.mkdtemp()
         self.config_dir = Path(self.temp_dir)
         self.data_file = self.config_dir / "projects.json"
-        project_cli.CONFIG_DIR = self.config_dir
-        project_cli.DATA_FILE = self.data_file
+        project_store.CONFIG_DIR = self.config_dir
+        project_store.DATA_FILE = self.data_file
 
     def tearDown(self):
         shutil.rmtree(self.temp_dir)
@@ -40,8 +42,8 @@ class TestProjectCLI(unittest.TestCase):
         self.assertEqual(code, 0)
         with self.data_file.open() as f:
             data = json.load(f)
-        self.assertIn('alpha', data)
-        self.assertEqual(data['active-project'], 'alpha')
+        self.assertIn('alpha', data['projects'])
+        self.assertEqual(data['meta']['active-project'], 'alpha')
 
     def test_add_duplicate_project(self):
         self.run_cli(['project', 'add', 'alpha'])
@@ -55,7 +57,7 @@ class TestProjectCLI(unittest.TestCase):
         self.assertEqual(code, 0)
         with self.data_file.open() as f:
             data = json.load(f)
-        self.assertEqual(data['active-project'], 'alpha')
+        self.assertEqual(data['meta']['active-project'], 'alpha')
 
     def test_switch_nonexistent_project(self):
         code = self.run_cli(['project', 'ghost'])
@@ -67,8 +69,8 @@ class TestProjectCLI(unittest.TestCase):
         self.assertEqual(code, 0)
         with self.data_file.open() as f:
             data = json.load(f)
-        self.assertIn('omega', data)
-        self.assertNotIn('alpha', data)
+        self.assertIn('omega', data['projects'])
+        self.assertNotIn('alpha', data['projects'])
 
     def test_rename_nonexistent_project(self):
         code = self.run_cli(['project', 'rename', 'ghost', 'omega'])
@@ -86,12 +88,331 @@ class TestProjectCLI(unittest.TestCase):
         self.assertEqual(code, 0)
         with self.data_file.open() as f:
             data = json.load(f)
-        self.assertNotIn('alpha', data)
+        self.assertNotIn('alpha', data['projects'])
 
     def test_remove_nonexistent_project(self):
         code = self.run_cli(['project', 'remove', 'ghost', '-y'])
         self.assertNotEqual(code, 0)
 
+    def test_undo_remove_restores_project_and_active(self):
+        self.run_cli(['project', 'add', 'alpha'])
+        self.run_cli(['project', 'add', 'beta'])
+        self.run_cli(['project', 'alpha'])
+        self.run_cli(['project', 'remove', 'alpha', '-y'])
+        code = self.run_cli(['project', 'undo'])
+        self.assertEqual(code, 0)
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertIn('alpha', data['projects'])
+        self.assertEqual(data['meta']['active-project'], 'alpha')
+
+    def test_undo_add_restores_active(self):
+        self.run_cli(['project', 'add', 'alpha'])
+        self.run_cli(['project', 'add', 'beta'])
+        self.run_cli(['project', 'undo'])
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertEqual(set(data['projects']), {'alpha'})
+        self.assertEqual(data['meta']['active-project'], 'alpha')
+        self.run_cli(['project', 'undo'])
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertEqual(data['projects'], {})
+        self.assertIsNone(data['meta']['active-project'])
+
+    def test_undo_multiple(self):
+        self.run_cli(['project', 'add', 'alpha'])
+        self.run_cli(['project', 'rename', 'alpha', 'omega'])
+        code = self.run_cli(['project', 'undo', '2'])
+        self.assertEqual(code, 0)
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertEqual(data['projects'], {})
+        self.assertEqual(project_store.read_journal(), [])
+        self.assertNotEqual(self.run_cli(['project', 'undo']), 0)
+
+    def test_undo_refuses_when_changed_outside(self):
+        self.run_cli(['project', 'add', 'alpha'])
+        with self.data_file.open() as f:
+            data = json.load(f)
+        data['projects']['alpha']['url'] = 'http://edited'
+        with self.data_file.open('w') as f:
+            json.dump(data, f)
+        self.assertNotEqual(self.run_cli(['project', 'undo']), 0)
+        self.assertEqual(self.run_cli(['project', 'undo', '--force']), 0)
+
+    def test_history(self):
+        self.run_cli(['project', 'add', 'alpha'])
+        self.run_cli(['project', 'remove', 'alpha', '-y'])
+        with mock.patch('sys.stdout') as mock_stdout:
+            self.run_cli(['project', 'history'])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertLess(output.index('remove alpha'), output.index('add alpha'))
+
+    def test_journal_is_capped(self):
+        with mock.patch.object(project_store, 'JOURNAL_MAX_BYTES', 2048):
+            for i in range(100):
+                self.run_cli(['project', 'add', f'p{i}'])
+        self.assertLessEqual(project_store.journal_file().stat().st_size, 2048)
+        self.assertEqual(project_store.read_journal()[-1]['op'], 'add p99')
+
+    def git(self, path, *args):
+        subprocess.run(['git', '-C', str(path), *args], check=True, capture_output=True)
+
+    def make_repo(self, name):
+        path = self.config_dir / name
+        path.mkdir()
+        self.git(path, 'init', '-q', '-b', 'main')
+        (path / 'a.txt').write_text('a')
+        self.git(path, 'add', 'a.txt')
+        self.git(path, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'init')
+        return path
+
+    def status_json(self, *extra):
+        with mock.patch('sys.stdout') as mock_stdout:
+            self.run_cli(['project', 'status', '--json', *extra])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        return json.loads(output)
+
+    def test_status(self):
+        clean, dirty = self.make_repo('clean'), self.make_repo('dirty')
+        (dirty / 'a.txt').write_text('changed')
+        self.git(dirty, 'checkout', '-qb', 'feature')
+        with self.data_file.open('w') as f:
+            json.dump({'meta': {'version': 2, 'active-project': 'c'}, 'projects': {
+                'c': {'dir': str(clean)}, 'd': {'dir': str(dirty)},
+                'gone': {'dir': str(self.config_dir / 'gone')}, 'web': {'url': 'http://x'},
+            }}, f)
+        results = self.status_json()
+        self.assertEqual(set(results), {'c', 'd', 'gone'})
+        self.assertEqual(results['c']['changes'], 0)
+        self.assertTrue(results['c']['default'])
+        self.assertEqual(results['d']['changes'], 1)
+        self.assertEqual(results['d']['branch'], 'feature')
+        self.assertFalse(results['d']['default'])
+        self.assertEqual(results['gone']['error'], 'missing')
+        self.assertEqual(set(self.status_json('--dirty')), {'d'})
+
+        # Edits to tracked files show up on the next run, even with cached results
+        (clean / 'a.txt').write_text('edited')
+        self.assertEqual(set(self.status_json('--dirty')), {'c', 'd'})
+        with mock.patch('sys.stderr'):
+            self.assertEqual(self.run_cli(['project', 'status', '-j', '-1']), 2)
+
+        # A git failure is reported, not counted as a clean repo
+        (clean / '.git' / 'index').write_bytes(b'DIRC')
+        results = self.status_json()
+        self.assertIn('index file', results['c']['error'])
+        self.assertEqual(set(self.status_json('--dirty')), {'d'})
+
+    def test_status_caches_ahead_behind(self):
+        repo = self.make_repo('r')
+        self.git(repo, 'update-ref', 'refs/remotes/origin/main', 'HEAD')
+        (repo / 'b.txt').write_text('b')
+        self.git(repo, 'add', 'b.txt')
+        self.git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'second')
+        with self.data_file.open('w') as f:
+            json.dump({'meta': {'version': 2, 'active-project': 'r'}, 'projects': {'r': {'dir': str(repo)}}}, f)
+        self.assertEqual(self.status_json()['r']['ahead'], 1)
+
+        real_git = project_cli._git
+        with mock.patch.object(project_cli, '_git', side_effect=real_git) as git:
+            results = self.status_json()
+        self.assertEqual((results['r']['ahead'], results['r']['behind']), (1, 0))
+        self.assertEqual([c.args[1] for c in git.call_args_list], ['status'])
+
+    def test_key_filter(self):
+        pred = project_cli.parse_key_filter('repo & (dir | !web)')
+        self.assertTrue(pred({'repo': 1, 'dir': 1}))
+        self.assertTrue(pred({'repo': 1}))
+        self.assertFalse(pred({'repo': 1, 'web': 1}))
+        self.assertFalse(pred({'dir': 1}))
+        for bad in ('repo &', '(repo', 'repo dir'):
+            self.assertRaises(ValueError, project_cli.parse_key_filter, bad)
+
+    def test_exec(self):
+        a, b = self.config_dir / 'a', self.config_dir / 'b'
+        a.mkdir()
+        b.mkdir()
+        with self.data_file.open('w') as f:
+            json.dump({'meta': {'version': 2, 'active-project': 'web'}, 'projects': {
+                'a': {'dir': str(a), 'repo': 'x'}, 'b': {'dir': str(b)}, 'web': {'url': 'http://x'},
+            }}, f)
+        before = self.data_file.read_bytes()
+        with mock.patch('sys.stdout') as mock_stdout:
+            code = self.run_cli(['project', 'exec', '--filter', 'repo & dir', '--',
+                                 'pwd && echo $PROJECT && test $PROJECT != b'])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertEqual(code, 0)
+        self.assertIn(f'a | {a}', output)
+        self.assertIn('a | a', output)
+        self.assertNotIn('b |', output)
+        self.assertEqual(self.data_file.read_bytes(), before)
+
+        with mock.patch('sys.stdout') as mock_stdout:
+            code = self.run_cli(['project', 'exec', '-j', '2', '--', 'test $PROJECT != b'])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertEqual(code, 1)
+        self.assertIn('1 succeeded, 1 failed', output)
+
+        with mock.patch('sys.stderr'):
+            self.assertEqual(self.run_cli(['project', 'exec', '-j', '0', '--', 'true']), 2)
+
+        # A directory under an unset root is reported for that project only
+        d = json.loads(self.data_file.read_text())
+        d['projects']['b']['dir'] = '$REPO/b'
+        self.data_file.write_text(json.dumps(d))
+        with mock.patch.dict(os.environ), mock.patch('sys.stdout') as mock_stdout:
+            os.environ.pop('REPO', None)
+            project_store.expand_path.cache_clear()
+            code = self.run_cli(['project', 'exec', '--', 'true'])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+            results = self.status_json()
+        project_store.expand_path.cache_clear()
+        self.assertEqual(code, 1)
+        self.assertIn('b | Environment variable $REPO', output)
+        self.assertIn('1 succeeded, 1 failed', output)
+        self.assertIn('$REPO', results['b']['error'])
+
+    def test_complete_project_names_cache(self):
+        self.run_cli(['project', 'add', 'alpha'])
+
+        def complete():
+            with mock.patch('sys.stdout') as mock_stdout:
+                self.run_cli(['project', '--_complete-project-names'])
+                return "".join([c[0][0] for c in mock_stdout.write.call_args_list]).split()
+
+        self.assertEqual(complete(), ['alpha'])
+        with mock.patch.object(project_store, 'read_store') as load:
+            self.assertEqual(complete(), ['alpha'])
+        load.assert_not_called()
+        self.run_cli(['project', 'add', 'beta'])
+        self.assertEqual(complete(), ['alpha', 'beta'])
+
+    def list_output(self, *argv):
+        with mock.patch('sys.stdout') as mock_stdout:
+            self.run_cli(['project', 'list', *argv])
+            return "".join([c[0][0] for c in mock_stdout.write.call_args_list]).split()
+
+    def test_tags(self):
+        for name in ('svc-a', 'svc-b', 'web'):
+            self.run_cli(['project', 'add', name])
+        self.assertEqual(self.run_cli(['project', 'tag', 'add', 'payments', 'svc-a', 'svc-b']), 0)
+        self.run_cli(['project', 'tag', 'add', 'backend', 'svc-b', 'web'])
+        self.assertNotEqual(self.run_cli(['project', 'tag', 'add', 'backend', 'ghost']), 0)
+
+        self.assertIn('found', self.list_output('--tag', 'payments', 'x'))
+        out = self.list_output('--tag', 'payments', '--tag', 'backend')
+        self.assertIn('svc-b', out)
+        self.assertNotIn('svc-a', out)
+        self.assertNotIn('web', out)
+        self.assertEqual(project_cli.projects_with_tags(project_store.load_data(), ['nope']), set())
+        self.assertEqual(' '.join(self.list_output('--tag', 'nope')), 'No projects tagged nope.')
+
+        self.run_cli(['project', 'rename', 'svc-b', 'svc-c'])
+        self.assertEqual(project_cli.projects_with_tags(project_store.load_data(), ['payments']), {'svc-a', 'svc-c'})
+        self.run_cli(['project', 'remove', 'svc-c', '-y'])
+        self.assertEqual(project_cli.projects_with_tags(project_store.load_data(), ['backend']), {'web'})
+        self.run_cli(['project', 'undo', '2'])
+        self.assertEqual(project_cli.projects_with_tags(project_store.load_data(), ['payments', 'backend']), {'svc-b'})
+
+        self.run_cli(['project', 'tag', 'remove', 'payments', 'svc-a', 'svc-b'])
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertNotIn('payments', data['tags'])
+
+    def test_relocate(self):
+        old, new = self.config_dir / 'old', self.config_dir / 'new'
+        with self.data_file.open('w') as f:
+            json.dump({'meta': {'version': 2, 'active-project': 'a'}, 'projects': {
+                'a': {'dir': str(old / 'a'), 'url': 'http://x'},
+                'b': {'dir': str(old)},
+                'c': {'dir': str(self.config_dir / 'older' / 'c')},
+            }}, f)
+        code = self.run_cli(['project', 'relocate', '--from', str(old), '--to', str(new)])
+        self.assertEqual(code, 0)
+        with self.data_file.open() as f:
+            projects = json.load(f)['projects']
+        self.assertEqual(projects['a'], {'dir': str(new / 'a'), 'url': 'http://x'})
+        self.assertEqual(projects['b'], {'dir': str(new)})
+        self.assertEqual(projects['c'], {'dir': str(self.config_dir / 'older' / 'c')})
+
+        with mock.patch.dict(os.environ, {'REPO': str(self.config_dir)}):
+            project_store.expand_path.cache_clear()
+            self.run_cli(['project', 'relocate', '--from', str(new), '--to', '$REPO/moved'])
+        project_store.expand_path.cache_clear()
+        with self.data_file.open() as f:
+            projects = json.load(f)['projects']
+        self.assertEqual(projects['a']['dir'], '$REPO/moved/a')
+
+        self.run_cli(['project', 'undo'])
+        with self.data_file.open() as f:
+            projects = json.load(f)['projects']
+        self.assertEqual(projects['a']['dir'], str(new / 'a'))
+
+        # An unset root variable is an error, not a path relative to the cwd
+        with mock.patch.dict(os.environ):
+            os.environ.pop('REPO', None)
+            code = self.run_cli(['project', 'relocate', '--from', str(new), '--to', '$REPO'])
+        self.assertNotEqual(code, 0)
+        with self.data_file.open() as f:
+            self.assertEqual(json.load(f)['projects'], projects)
+
+    def test_derived_not_stamped_with_concurrent_write(self):
+        self.run_cli(['project', 'add', 'alpha'])
+
+        def build(d):
+            names = list(d['projects'])
+            self.run_cli(['project', 'add', 'beta'])  # another writer between read and cache write
+            return names
+
+        self.assertEqual(project_store.derived('names', build), ['alpha'])
+        self.assertEqual(project_store.derived('names', lambda d: list(d['projects'])), ['alpha', 'beta'])
+
+    def test_journal_keeps_oversized_newest_entry(self):
+        for i in range(20):
+            self.run_cli(['project', 'add', f'p{i}'])
+        with mock.patch.object(project_store, 'JOURNAL_MAX_BYTES', 256):
+            project_store.journal_append('big', {'p0': [{'dir': 'x' * 1024}, {}]})
+        entries = project_store.read_journal()
+        self.assertEqual([e['op'] for e in entries], ['big'])
+        self.assertEqual(self.run_cli(['project', 'undo']), 0)
+        with self.data_file.open() as f:
+            self.assertEqual(json.load(f)['projects']['p0'], {'dir': 'x' * 1024})
+
+    def test_migrates_legacy_store(self):
+        with self.data_file.open('w') as f:
+            json.dump({'active-project': 'alpha', 'alpha': {'url': 'http://a'}, 'beta': {}}, f)
+        with mock.patch('sys.stdout') as mock_stdout:
+            self.run_cli(['project', 'list'])
+            output = "".join([c[0][0] for c in mock_stdout.write.call_args_list])
+        self.assertNotIn('active-project', output)
+        self.assertTrue(output.rstrip().endswith('2'))
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertEqual(data['meta']['version'], project_store.SCHEMA_VERSION)
+        self.assertEqual(data['meta']['active-project'], 'alpha')
+        self.assertEqual(set(data['projects']), {'alpha', 'beta'})
+
+    def test_unversioned_v2_store_is_not_renested(self):
+        with self.data_file.open('w') as f:
+            json.dump({'meta': {'active-project': 'alpha'}, 'projects': {'alpha': {}}, 'tags': {'t': ['alpha']}}, f)
+        self.assertEqual(self.run_cli(['project', 'add', 'beta']), 0)
+        with self.data_file.open() as f:
+            data = json.load(f)
+        self.assertEqual(data['meta']['version'], project_store.SCHEMA_VERSION)
+        self.assertEqual(set(data['projects']), {'alpha', 'beta'})
+        self.assertEqual(data['tags'], {'t': ['alpha']})
+
+    def test_compact_format(self):
+        for lib in (project_store.orjson, None):
+            with mock.patch.object(project_store, 'STORE_FORMAT', 'compact'), \
+                    mock.patch.object(project_store, 'orjson', lib):
+                self.run_cli(['project', 'add', 'alpha', '--force'])
+            raw = self.data_file.read_text()
+            self.assertNotIn('\n', raw)
+            self.assertEqual(json.loads(raw)['meta']['active-project'], 'alpha')
+
 
 if __name__ == '__main__':
     unittest.main()
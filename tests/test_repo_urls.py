@@ -0,0 +1,78 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import json
+import os
+from unittest import mock
+from pathlib import Path
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'script'))
+sys.path.append(parent_dir)
+
+import repo_urls
+import project_store
+
+
+class TestRepoUrls(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir)
+        repo_urls.CONFIG_DIR = self.config_dir
+        project_store.CONFIG_DIR = self.config_dir
+        project_store.DATA_FILE = self.config_dir / "projects.json"
+        repo_urls.CACHE_FILE = self.config_dir / "repo-urls.json"
+        repo_urls.PROVIDERS_FILE = self.config_dir / "providers.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_bitbucket_server(self):
+        info = repo_urls.parse_repo_url("https://git.example.no/projects/PAY/repos/svc-a/browse")
+        self.assertEqual(info["provider"], "bitbucket-server")
+        self.assertEqual((info["workspace"], info["repo"]), ("PAY", "svc-a"))
+        self.assertEqual(info["web_url"], "https://git.example.no/projects/PAY/repos/svc-a")
+        self.assertEqual(info["clone_url"], "https://git.example.no/scm/PAY/svc-a.git")
+
+    def test_userinfo_and_ports(self):
+        ssh = repo_urls.parse_repo_url("ssh://git@git.example.no:7999/scm/pay/svc-a.git")
+        self.assertEqual(ssh["host"], "git.example.no")
+        self.assertEqual(ssh["clone_url"], "https://git.example.no/scm/pay/svc-a.git")
+        with repo_urls.PROVIDERS_FILE.open("w") as f:
+            json.dump({"code.internal": "gitlab"}, f)
+        https = repo_urls.parse_repo_url("https://code.internal:8443/owner/tool")
+        self.assertEqual(https["provider"], "gitlab")
+        self.assertEqual(https["web_url"], "https://code.internal:8443/owner/tool")
+
+    def test_github_and_gitlab(self):
+        gh = repo_urls.parse_repo_url("https://github.com/owner/tool/tree/main")
+        self.assertEqual(gh["clone_url"], "https://github.com/owner/tool.git")
+        gl = repo_urls.parse_repo_url("https://gitlab.com/group/sub/tool/-/tree/main")
+        self.assertEqual((gl["workspace"], gl["repo"]), ("group/sub", "tool"))
+
+    def test_configured_host(self):
+        with self.assertRaises(ValueError):
+            repo_urls.parse_repo_url("https://code.internal/owner/tool")
+        with repo_urls.PROVIDERS_FILE.open("w") as f:
+            json.dump({"code.internal": "gitlab"}, f)
+        info = repo_urls.parse_repo_url("https://code.internal/owner/tool")
+        self.assertEqual(info["provider"], "gitlab")
+
+    def test_enrich_projects_uses_sidecar(self):
+        with project_store.DATA_FILE.open("w") as f:
+            json.dump({"meta": {"version": 2, "active-project": None}, "projects": {
+                "svc-a": {"repo": "https://git.example.no/projects/PAY/repos/svc-a"},
+                "broken": {"repo": "https://unknown.host/x"},
+                "local": {"dir": "/src/local"},
+            }}, f)
+        result, errors = repo_urls.enrich_projects()
+        self.assertEqual(set(result), {"svc-a"})
+        self.assertEqual(set(errors), {"broken"})
+        with mock.patch.object(repo_urls, "parse_repo_url", side_effect=ValueError) as parse:
+            result2, _ = repo_urls.enrich_projects()
+        parse.assert_called_once()  # only the unparseable URL is retried
+        self.assertEqual(result, result2)
+
+
+if __name__ == "__main__":
+    unittest.main()
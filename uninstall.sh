@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-BIN_NAME="project"
+BIN_NAMES=("project" "goto")
 CONFIG_DIR="$HOME/.project-cli"
 PURGE=false
 YES=false
@@ -23,24 +23,37 @@ EOF
   esac
 done
 
-TARGET=$(command -v "$BIN_NAME" || true)
-if [[ -z "${TARGET}" ]]; then
-  for c in "/opt/homebrew/bin/$BIN_NAME" "/usr/local/bin/$BIN_NAME"; do
-    if [[ -x "$c" ]]; then TARGET="$c"; break; fi
-  done
-fi
+for BIN_NAME in "${BIN_NAMES[@]}"; do
+  TARGET=$(command -v "$BIN_NAME" || true)
+  if [[ -z "${TARGET}" ]]; then
+    for c in "/opt/homebrew/bin/$BIN_NAME" "/usr/local/bin/$BIN_NAME"; do
+      if [[ -x "$c" ]]; then TARGET="$c"; break; fi
+    done
+  fi
+
+  if [[ -n "${TARGET}" ]]; then
+    echo "Removing binary: $TARGET"
+    if [[ -w "$TARGET" ]]; then
+      rm -f "$TARGET"
+    else
+      echo "Not writable. Attempting with sudo..."
+      sudo rm -f "$TARGET"
+    fi
+    echo "Removed $TARGET"
+    BIN_DIR="$(dirname "$TARGET")"
+  else
+    echo "No '$BIN_NAME' binary found."
+  fi
+done
 
-if [[ -n "${TARGET}" ]]; then
-  echo "Removing binary: $TARGET"
-  if [[ -w "$TARGET" ]]; then
-    rm -f "$TARGET"
+# Shared storage module installed next to the commands
+if [[ -n "${BIN_DIR:-}" && -f "$BIN_DIR/project_store.py" ]]; then
+  if [[ -w "$BIN_DIR/project_store.py" ]]; then
+    rm -f "$BIN_DIR/project_store.py"
   else
-    echo "Not writable. Attempting with sudo..."
-    sudo rm -f "$TARGET"
+    sudo rm -f "$BIN_DIR/project_store.py"
   fi
-  echo "Removed $TARGET"
-else
-  echo "No '$BIN_NAME' binary found."
+  echo "Removed $BIN_DIR/project_store.py"
 fi
 
 if [[ "$PURGE" == true ]]; then